@@ -1,6 +1,20 @@
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from projections import generate_projections
 from solves.normal import normal_solve
 from solves.drs import drs_solve
+from solves.config import load_solver_config
+from solves.data import split_projections
+from solves.team import print_solve_result, ask_to_save_team
+
+SOLVE_CACHE_FILE = os.path.join("data", ".solve_cache.pkl")
+# Bump whenever the solve result dictionaries change, so results pickled by older code are not reused
+SOLVE_CACHE_VERSION = 2
 
 def fetch_projections():
     """
@@ -18,9 +32,63 @@ def fetch_projections():
     projections = generate_projections()
     return projections
 
-def run_all_solves(projections, show_outputs=False, ask_save=False):
+def run_all_solves(projections):
     """
-    Runs all solve types and returns a list of results.
+    Runs all solve types concurrently and returns a list of results.
+
+    Each solve only reads the projections and builds its own model, so the solves
+    are dispatched to a thread pool and run concurrently. The configured solver
+    threads are shared between the solves so the CPU is not oversubscribed.
+    Outputs and save prompts are always disabled for these solves.
+
+    Args:
+        projections (pd.DataFrame): The projections DataFrame.
+
+    Returns:
+        list: A list of dictionaries containing the results of different solve types,
+            in the order Normal, Wildcard, Limitless, DRS Boost.
+    """
+    # Split the projections once rather than in each solve
+    projections = split_projections(projections)
+    config = load_solver_config() or {}
+    threads = max(1, (config.get('solver_threads') or os.cpu_count()) // 4)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(normal_solve, projections, show_prints=False, ask_to_save=False, threads=threads),
+            executor.submit(normal_solve, projections, is_wildcard=True, show_prints=False, ask_to_save=False, threads=threads),
+            executor.submit(normal_solve, projections, is_limitless=True, show_prints=False, ask_to_save=False, threads=threads),
+            executor.submit(drs_solve, projections, show_prints=False, ask_to_save=False, threads=threads)]
+        return [future.result() for future in futures]
+
+def solve_cache_key(projections):
+    """
+    Builds the key identifying a set of baseline solve results.
+
+    The results only change when the saved team, the projections or the solver
+    configuration change, so the key combines the modification time of
+    'data/team.json' with hashes of the projections and the config. The key also
+    carries `SOLVE_CACHE_VERSION` so results in an older format are never reused.
+
+    Args:
+        projections (pd.DataFrame): The projections DataFrame.
+
+    Returns:
+        tuple: The cache key.
+    """
+    team_file = os.path.join("data", "team.json")
+    try:
+        team_mtime = os.stat(team_file).st_mtime_ns
+    except FileNotFoundError:
+        team_mtime = None
+    projections_hash = hashlib.blake2b(pd.util.hash_pandas_object(projections, index=False).values.tobytes()).hexdigest()
+    config = json.dumps(load_solver_config(), sort_keys=True)
+    return (SOLVE_CACHE_VERSION, team_mtime, projections_hash, config)
+
+def run_all_solves_cached(projections):
+    """
+    Returns the baseline solve results, reusing those saved in the solve cache if still valid.
+
+    On a miss all solves are run with `run_all_solves` and the results are written
+    to 'data/.solve_cache.pkl' for the next run.
 
     Args:
         projections (pd.DataFrame): The projections DataFrame.
@@ -28,10 +96,23 @@ def run_all_solves(projections, show_outputs=False, ask_save=False):
     Returns:
         list: A list of dictionaries containing the results of different solve types.
     """
-    return [normal_solve(projections, show_prints=show_outputs, ask_to_save=ask_save), 
-        normal_solve(projections, is_wildcard=True, show_prints=show_outputs, ask_to_save=ask_save), 
-        normal_solve(projections, is_limitless=True, show_prints=show_outputs, ask_to_save=ask_save), 
-        drs_solve(projections, show_prints=show_outputs, ask_to_save=ask_save)]
+    key = solve_cache_key(projections)
+    # The cache is disposable, so any file that can't be loaded or doesn't match is treated as a miss
+    try:
+        with open(SOLVE_CACHE_FILE, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['key'] == key:
+            return cached['results']
+    except Exception:
+        pass
+
+    results = run_all_solves(projections)
+
+    # Ensure the 'data' directory exists
+    os.makedirs("data", exist_ok=True)
+    with open(SOLVE_CACHE_FILE, 'wb') as f:
+        pickle.dump({"key": key, "results": results}, f)
+    return results
 
 def compare_solves(solves = []):
     """
@@ -43,11 +124,9 @@ def compare_solves(solves = []):
     Returns:
         dict: A dictionary mapping solve types to their differences from normal solve
     """
-    normal_xpts = solves[0]['base_xPts']
-    differences = {}
-    for solve in solves:
-        differences[solve['solve_name']] = solve['base_xPts'] - normal_xpts
-    return differences
+    xpts = np.fromiter((solve['base_xPts'] for solve in solves), dtype=np.float64, count=len(solves))
+    diffs = xpts - xpts[0]
+    return {solve['solve_name']: diff for solve, diff in zip(solves, diffs.tolist())}
 
 def menu(differences):
     """
@@ -88,44 +167,68 @@ def menu(differences):
     print(f"You have selected: {solve_map[choice]}")
     return choice
 
-def call_chosen_solve(projections, choice):
+def call_chosen_solve(choice, solve_results):
     """
-    Calls the chosen solve function based on the user's choice.
+    Displays the cached result of the solve chosen by the user and offers to save it.
+
+    The solves have already been run by `run_all_solves`, so the stored result is
+    reused rather than solving the same model a second time.
 
     Args:
-        projections (pd.DataFrame): The DataFrame containing the projections.
         choice (str): The user's choice as a string, one of the following:
             "1", "2", "3", "4", "5"
+        solve_results (dict): Dictionary mapping solve names to their results.
+
+    Returns:
+        bool: True if the team was saved to 'data/team.json', False otherwise.
     """
-    if choice == "1":
-        normal_projections = normal_solve(projections)
-    elif choice == "2":
-        wildcard_projections = normal_solve(projections, is_wildcard=True)
-    elif choice == "3":
-        limitless_projections = normal_solve(projections, is_limitless=True)
-    elif choice == "4":
-        drs_projections = drs_solve(projections)  
+    choice_map = {
+        "1": "Normal",
+        "2": "Wildcard",
+        "3": "Limitless",
+        "4": "DRS Boost"
+    }
+
+    team_saved = False
+    if choice in choice_map:
+        result = solve_results.get(choice_map[choice])
+        if result is None:
+            print("No optimal solution found. Please check the constraints or input data.")
+        else:
+            print_solve_result(result)
+            team_saved = ask_to_save_team(result)
     elif choice == "5":
         print("Exiting the program.")
         exit()
     else:
         print("Could not launch a solve for invalid solve type.")
 
+    return team_saved
+
+def ask_run_again():
+    """
+    Asks the user whether they would like to run another solve.
+
+    Returns:
+        bool: True if the user answered "y", False otherwise.
+    """
     run_again = input("Would you like to run another solve? (y/n): ")
-    if run_again == "y":
-        return True
-    else:
-        return False
+    return run_again == "y"
 
 
 def main():
     projections = fetch_projections()
-    # Get initial differences by running all solves silently
-    differences = compare_solves(run_all_solves(projections, show_outputs=False, ask_save=False))
+    solve_results = None
     run_again = True
     while run_again:
+        # Run the silent solves to get the differences, re-solving only once the saved team changes
+        if solve_results is None:
+            solve_results = {result['solve_name']: result for result in run_all_solves_cached(projections)}
+            differences = compare_solves(list(solve_results.values()))
         choice = menu(differences)
-        run_again = call_chosen_solve(projections, choice)
+        if call_chosen_solve(choice, solve_results):
+            solve_results = None
+        run_again = ask_run_again()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+import json
+import os
+import yaml
+from functools import lru_cache
+
+# JSON is the preferred format; the YAML file is still read if it is the only one present
+CONFIG_FILES = [
+    os.path.join("config", "solver_config.json"),
+    os.path.join("config", "solver_config.yml")
+]
+
+# Use the libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@lru_cache(maxsize=2)
+def _load_config_file(path, mtime_ns):
+    """
+    Parse a solver config file, cached until the file's modification time changes.
+
+    Args:
+        path (str): Path to the JSON or YAML config file.
+        mtime_ns (int): Modification time of the file, used to invalidate the cache.
+
+    Returns:
+        dict: The parsed solver configuration.
+    """
+    with open(path, 'r') as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+def load_solver_config():
+    """
+    Load the solver configuration from the config directory.
+
+    Returns:
+        dict: The parsed solver configuration, or None if no config file exists.
+            Callers must not mutate it.
+    """
+    for config_file in CONFIG_FILES:
+        # The stat supplies the cache key; the file can still vanish before it is opened
+        try:
+            return _load_config_file(config_file, os.stat(config_file).st_mtime_ns)
+        except FileNotFoundError:
+            continue
+    return None
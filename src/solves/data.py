@@ -0,0 +1,114 @@
+import hashlib
+import numpy as np
+
+# Columns carried through to the solves for each player
+PLAYER_COLUMNS = ['name', 'price', 'xPts', 'price_change']
+
+# Slack on the affordability cut, since the bound summed from 0.1m prices can land a few ULPs below an exact fit
+PRICE_TOLERANCE = 1e-6
+
+def split_projections(projections):
+    """
+    Split the projections into driver and constructor column arrays.
+
+    Each group is stored as a dictionary of NumPy arrays (one per column in
+    `PLAYER_COLUMNS`) so the solves can build their models without pandas indexing.
+    Solves accept either the raw projections or the result of this function, so
+    callers running several solves can split the projections once and share them.
+
+    Args:
+        projections (pd.DataFrame | dict): DataFrame containing projections with columns:
+            'name', 'is_driver', 'is_constructor', 'price', 'xPts', 'price_change',
+            or a dictionary already returned by this function.
+
+    Returns:
+        dict: A dictionary with keys 'driver' and 'constructor', each mapping column
+            names to NumPy arrays aligned by position.
+    """
+    if isinstance(projections, dict):
+        return projections
+
+    driver_mask = projections['is_driver'].to_numpy() == True
+    constructor_mask = projections['is_constructor'].to_numpy() == True
+    columns = {column: projections[column].to_numpy() for column in PLAYER_COLUMNS}
+    return {
+        "driver": {column: values[driver_mask] for column, values in columns.items()},
+        "constructor": {column: values[constructor_mask] for column, values in columns.items()}
+    }
+
+def prune_players(players, team_size, price_change_weight, max_price, keep=frozenset()):
+    """
+    Drop players that cannot be part of an optimal team before the model is built.
+
+    A player is dropped if they cost more than `max_price`, or if at least
+    `team_size` other players dominate them (no more expensive, no fewer xPts and
+    no worse weighted price change, strictly better in at least one). Any team
+    containing a dominated player can then swap them for a dominating player it
+    does not already contain without losing points, so the optimum is unaffected.
+    Players in `keep` are never dropped, since swapping them out costs a transfer.
+
+    Prices are compared against `max_price` with a small tolerance, so a player who
+    exactly fits the budget is kept even when floating point error puts the bound
+    just below their price:
+
+    >>> drivers = {
+    ...     'name': np.array(['Star', 'A', 'B', 'C', 'D', 'E', 'F']),
+    ...     'price': np.array([61.6, 4.6, 6.0, 7.8, 7.8, 9.0, 9.5]),
+    ...     'xPts': np.array([100.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]),
+    ...     'price_change': np.zeros(7)
+    ... }
+    >>> constructor_prices = np.array([5.9, 6.3, 8.0])
+    >>> max_price = 100.0 - np.sort(drivers['price'])[:4].sum() - np.sort(constructor_prices)[:2].sum()
+    >>> bool(max_price < 61.6)
+    True
+    >>> 'Star' in prune_players(drivers, 5, 0, max_price)['name']
+    True
+
+    Args:
+        players (dict): Column arrays for one player group, as returned by `split_projections`.
+        team_size (int): Number of players of this group in a team.
+        price_change_weight (float): Weight applied to price changes in the objective.
+        max_price (float): Highest price that still leaves room for the rest of a team.
+        keep (frozenset, optional): Names of players that must not be dropped.
+
+    Returns:
+        dict: The column arrays restricted to the remaining players.
+    """
+    price = players['price']
+    xpts = players['xPts']
+    pc_score = price_change_weight * players['price_change']
+
+    # dominates[i, j] is True when player i dominates player j
+    no_worse = (
+        (price[:, None] <= price[None, :]) &
+        (xpts[:, None] >= xpts[None, :]) &
+        (pc_score[:, None] >= pc_score[None, :])
+    )
+    strictly_better = (
+        (price[:, None] < price[None, :]) |
+        (xpts[:, None] > xpts[None, :]) |
+        (pc_score[:, None] > pc_score[None, :])
+    )
+    dominated = (no_worse & strictly_better).sum(axis=0) >= team_size
+
+    kept = np.isin(players['name'], list(keep))
+    mask = kept | ((price <= max_price + PRICE_TOLERANCE) & ~dominated)
+    return {column: values[mask] for column, values in players.items()}
+
+def projections_hash(split):
+    """
+    Hash the split projections so identical inputs can be recognised between solves.
+
+    Args:
+        split (dict): The driver/constructor column arrays returned by `split_projections`.
+
+    Returns:
+        str: A hex digest covering every player's name, price, xPts and price change.
+    """
+    digest = hashlib.blake2b()
+    for group in ("driver", "constructor"):
+        players = split[group]
+        digest.update("\0".join(players['name']).encode())
+        for column in PLAYER_COLUMNS[1:]:
+            digest.update(np.ascontiguousarray(players[column], dtype=np.float64).tobytes())
+    return digest.hexdigest()
@@ -1,28 +1,43 @@
 import pulp as lp
 import pandas as pd
+import numpy as np
+import copy
 import json
 import os
-import yaml
+from itertools import chain
+from solves.config import load_solver_config
+from solves.data import split_projections, prune_players, projections_hash
+from solves.solver import get_solver, uses_warm_start
+from solves.team import load_team_state, report_solve_result
+from solves.warm_start import set_previous_team_start
 
-def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints=True, ask_to_save=True):
+# Most recent solution and its player pool for each solve type, reused as a MIP start by later solves
+_last_solutions = {}
+
+# Inputs and result of the latest solve of each type, returned without re-solving when nothing has changed
+_solve_results = {}
+
+def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints=True, ask_to_save=True, threads=None):
     """
     Perform a normal solve for the Fantasy F1 team selection with weighted price change.
     
     This function sets up and solves a linear programming problem to select an optimal team
     of 5 drivers and 2 constructors. In the optimization objective the expected points (xPts)
     are augmented by a bonus derived from each player's projected price change weighted by
-    a factor defined in the config file (config/solver_config.yml, variable 'price_change_weight').
+    a factor defined in the config file (config/solver_config.json, variable 'price_change_weight').
     
     When printing the results, the reported total expected points (xPts) exclude the price
     change bonus (i.e. they only reflect the base xPts value).
     
     Args:
-        projections (pd.DataFrame): DataFrame containing projections with columns:
-            'name', 'is_driver', 'is_constructor', 'price', 'xPts', 'price_change'.
+        projections (pd.DataFrame | dict): DataFrame containing projections with columns:
+            'name', 'is_driver', 'is_constructor', 'price', 'xPts', 'price_change',
+            or the driver/constructor split returned by `split_projections`.
         is_wildcard (bool, optional): Indicates if the solve is for a wildcard scenario, affecting transfer limits. Defaults to False.
         is_limitless (bool, optional): Indicates if the solve is for a limitless scenario, which alters budget constraints. Defaults to False.
         show_prints (bool, optional): Whether to print output messages. Defaults to True.
         ask_to_save (bool, optional): Whether to prompt the user to save the team configuration. Defaults to True.
+        threads (int, optional): Solver threads, overriding 'solver_threads' from the config. Defaults to None.
     
     Returns:
         dict: A dictionary containing the selected drivers, constructors, and other relevant details
@@ -32,17 +47,17 @@ def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints
         if show_prints:
             print(*args, **kwargs)
 
-    # Load the solver configuration from config/solver_config.yml
-    config_file = os.path.join("config", "solver_config.yml")
-    if os.path.exists(config_file):
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+    # Load the solver configuration from config/solver_config.json
+    config = load_solver_config()
+    if config is not None:
         price_change_weight = config.get('price_change_weight', 0)
         roll_transfer_weight = config.get('roll_transfer_weight', 0)
+        solver_threads = threads or config.get('solver_threads') or os.cpu_count()
     else:
         print_if_enabled("Config file not found. Defaulting price_change_weight to 0.")
         price_change_weight = 0
         roll_transfer_weight = 0
+        solver_threads = threads or os.cpu_count()
 
     # The team reverts if the limitless chip is played, so price changes and rolled transfers don;'t matter.
     if is_limitless:
@@ -53,30 +68,39 @@ def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints
     if is_wildcard:
         roll_transfer_weight = 0
 
+    # Separate drivers and constructors from projections, unless already split by the caller
+    split = split_projections(projections)
+
     # Load previous team from 'data/team.json' if it exists
-    if os.path.exists('data/team.json'):
-        with open('data/team.json', 'r') as f:
-            try:
-                data = json.load(f)
-                previous_drivers = data['drivers']
-                previous_constructors = data['constructors']
-                available_transfers = data['available_transfers']
-                remaining_budget = data['remaining_budget']
-            except json.JSONDecodeError:
-                print_if_enabled("Invalid JSON data in 'data/team.json'. Using default values.")
-                previous_drivers = []
-                previous_constructors = []
-                available_transfers = 1000
-                remaining_budget = 100.0
+    try:
+        data = load_team_state()
+    except FileNotFoundError:
+        data = None
+    except json.JSONDecodeError:
+        print_if_enabled("Invalid JSON data in 'data/team.json'. Using default values.")
+        data = {"drivers": [], "constructors": [], "available_transfers": 1000, "remaining_budget": 100.0}
+
+    # Identical projections, team and config give the same answer, so reuse an earlier solve outright
+    result_key = (
+        projections_hash(split),
+        json.dumps(config, sort_keys=True), json.dumps(data, sort_keys=True)
+    )
+    last_key, last_result = _solve_results.get((is_wildcard, is_limitless), (None, None))
+    if last_key == result_key:
+        # Hand out a copy so callers can't alter the stored result
+        return report_solve_result(copy.deepcopy(last_result), show_prints=show_prints, ask_to_save=ask_to_save)
 
-        # Separate drivers and constructors from projections
-        drivers = projections[projections['is_driver'] == True].set_index('name')
-        constructors = projections[projections['is_constructor'] == True].set_index('name')
+    if data is not None:
+        previous_drivers = data['drivers']
+        previous_constructors = data['constructors']
+        available_transfers = data['available_transfers']
+        remaining_budget = data['remaining_budget']
 
         # Calculate current team value based on current prices
-        previous_drivers_prices = [drivers.loc[d, 'price'] for d in previous_drivers if d in drivers.index]
-        previous_constructors_prices = [constructors.loc[c, 'price'] for c in previous_constructors if c in constructors.index]
-        current_team_value = sum(previous_drivers_prices) + sum(previous_constructors_prices)
+        current_team_value = (
+            split['driver']['price'][np.isin(split['driver']['name'], previous_drivers)].sum() +
+            split['constructor']['price'][np.isin(split['constructor']['name'], previous_constructors)].sum()
+        )
 
         # Set cost cap as current team value plus remaining budget
         cost_cap = current_team_value + remaining_budget
@@ -95,36 +119,55 @@ def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints
     elif is_wildcard:
         available_transfers = 1000
 
-    # In case drivers/constructors were not defined above
-    if 'drivers' not in locals():
-        drivers = projections[projections['is_driver'] == True].set_index('name')
-        constructors = projections[projections['is_constructor'] == True].set_index('name')
+    # Sets for O(1) membership checks against the previous team
+    prev_driver_set = frozenset(previous_drivers)
+    prev_constructor_set = frozenset(previous_constructors)
+
+    # Drop players that are unaffordable or dominated by enough others to never be picked
+    cheapest_drivers = np.sort(split['driver']['price'])
+    cheapest_constructors = np.sort(split['constructor']['price'])
+    drivers = prune_players(
+        split['driver'], 5, price_change_weight,
+        cost_cap - cheapest_drivers[:4].sum() - cheapest_constructors[:2].sum(), prev_driver_set
+    )
+    constructors = prune_players(
+        split['constructor'], 2, price_change_weight,
+        cost_cap - cheapest_drivers[:5].sum() - cheapest_constructors[:1].sum(), prev_constructor_set
+    )
+    driver_names = drivers['name']
+    driver_xpts = drivers['xPts']
+    driver_prices = drivers['price']
+    driver_pc = drivers['price_change']
+    constructor_names = constructors['name']
+    constructor_xpts = constructors['xPts']
+    constructor_prices = constructors['price']
+    constructor_pc = constructors['price_change']
 
     # Initialize the PuLP problem
     prob = lp.LpProblem("Fantasy_F1_Normal_Solve", lp.LpMaximize)
 
-    # Define decision variables
-    x = lp.LpVariable.dicts("driver", drivers.index, 0, 1, lp.LpBinary)           # Driver selection
-    y = lp.LpVariable.dicts("constructor", constructors.index, 0, 1, lp.LpBinary)  # Constructor selection
-    b = lp.LpVariable.dicts("boost", drivers.index, 0, 1, lp.LpBinary)             # DRS boost assignment
+    # Define decision variables, stored positionally in the same order as the coefficient arrays
+    x = [lp.LpVariable(f"driver_{d}", 0, 1, lp.LpBinary) for d in driver_names]         # Driver selection
+    y = [lp.LpVariable(f"constructor_{c}", 0, 1, lp.LpBinary) for c in constructor_names]  # Constructor selection
+    b = [lp.LpVariable(f"boost_{d}", 0, 1, lp.LpBinary) for d in driver_names]           # DRS boost assignment
     penalty_transfers = lp.LpVariable("penalty_transfers", 0, None, lp.LpContinuous) # Excess transfers
     roll_transfer = lp.LpVariable("roll_transfer", 0, 1, lp.LpBinary)  # Binary variable for rolling a transfer
 
     # Constraints
-    prob += lp.lpSum([x[d] for d in drivers.index]) == 5, "Exactly_5_Drivers"
-    prob += lp.lpSum([y[c] for c in constructors.index]) == 2, "Exactly_2_Constructors"
-    prob += (
-        lp.lpSum([drivers.loc[d, 'price'] * x[d] for d in drivers.index]) +
-        lp.lpSum([constructors.loc[c, 'price'] * y[c] for c in constructors.index])
-    ) <= cost_cap, "Cost_Cap"
-    prob += lp.lpSum([b[d] for d in drivers.index]) == 1, "One_DRS_Boost"
-    for d in drivers.index:
-        prob += b[d] <= x[d], f"Boost_Only_If_Selected_{d}"
+    prob += lp.lpSum(x) == 5, "Exactly_5_Drivers"
+    prob += lp.lpSum(y) == 2, "Exactly_2_Constructors"
+    prob += lp.lpDot(driver_prices, x) + lp.lpDot(constructor_prices, y) <= cost_cap, "Cost_Cap"
+    prob += lp.lpSum(b) == 1, "One_DRS_Boost"
+    # Build the boost constraints directly rather than through the comparison and += overloads
+    for d, b_var, x_var in zip(driver_names, b, x):
+        prob.addConstraint(lp.LpConstraint(
+            lp.LpAffineExpression([(b_var, 1), (x_var, -1)]), lp.LpConstraintLE, f"Boost_Only_If_Selected_{d}", 0
+        ))
 
     # Transfer calculation and penalty constraint
     total_transfers = (
-        lp.lpSum([x[d] for d in drivers.index if d not in previous_drivers]) +
-        lp.lpSum([y[c] for c in constructors.index if c not in previous_constructors])
+        lp.lpSum([var for d, var in zip(driver_names, x) if d not in prev_driver_set]) +
+        lp.lpSum([var for c, var in zip(constructor_names, y) if c not in prev_constructor_set])
     )
     prob += penalty_transfers >= total_transfers - available_transfers, "Penalty_Transfers"
     
@@ -133,124 +176,97 @@ def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints
         prob += roll_transfer <= 1 - (total_transfers / available_transfers), "Roll_Transfer_Condition"
 
     # Build the objective function
-    # Base expected points (without price change bonus)
-    base_points = (
-        lp.lpSum([constructors.loc[c, 'xPts'] * y[c] for c in constructors.index]) +
-        lp.lpSum([drivers.loc[d, 'xPts'] * x[d] for d in drivers.index]) +
-        lp.lpSum([drivers.loc[d, 'xPts'] * b[d] for d in drivers.index])
-    )
+    # Base expected points (without price change bonus), a boosted driver scoring their xPts twice
+    base_points = lp.lpDot(constructor_xpts, y) + lp.lpDot(driver_xpts, [x_var + b_var for x_var, b_var in zip(x, b)])
     # Weighted price change bonus term
-    price_change_term = (
-        lp.lpSum([constructors.loc[c, 'price_change'] * y[c] for c in constructors.index]) +
-        lp.lpSum([drivers.loc[d, 'price_change'] * x[d] for d in drivers.index])
-    )
+    price_change_term = lp.lpDot(constructor_pc, y) + lp.lpDot(driver_pc, x)
     # Combine the two, subtracting the penalty for excess transfers and adding bonus for rolling transfers
     objective = base_points + price_change_weight * price_change_term - 10 * penalty_transfers + roll_transfer_weight * roll_transfer
     prob += objective, "Total_Expected_Points_With_PriceChange_And_RollTransfer"
 
+    # Warm-start HiGHS_CMD or CBC from the last solution of this solve type, falling back to the previous team.
+    # The in-process HiGHS API ignores initial values, so they are only set when the solver will read them.
+    solver_reads_start = uses_warm_start()
+    warm_start = solver_reads_start
+    solve_key = (is_wildcard, is_limitless)
+    player_pool = (tuple(driver_names), tuple(constructor_names))
+    last_pool, last_solution = _last_solutions.get(solve_key, (None, None))
+    if warm_start and last_pool == player_pool:
+        for variables, values in zip((x, y, b), last_solution):
+            for var, value in zip(variables, values):
+                var.setInitialValue(round(value))
+    elif warm_start:
+        warm_start = set_previous_team_start(
+            dict(zip(driver_names, x)), dict(zip(constructor_names, y)), [dict(zip(driver_names, b))],
+            previous_drivers, previous_constructors, dict(zip(driver_names, driver_xpts))
+        )
+        if warm_start:
+            penalty_transfers.setInitialValue(0)
+            roll_transfer.setInitialValue(0)
+
     # Solve the problem with suppressed solver output
-    status = prob.solve(lp.PULP_CBC_CMD(msg=False))
+    status = prob.solve(get_solver(solver_threads, warm_start))
     if status != lp.LpStatusOptimal:
         print_if_enabled("No optimal solution found. Please check the constraints or input data.")
         return
 
     # Extract results
-    selected_drivers = [d for d in drivers.index if lp.value(x[d]) == 1]
-    selected_constructors = [c for c in constructors.index if lp.value(y[c]) == 1]
-    boosted_driver = [d for d in drivers.index if lp.value(b[d]) == 1][0]
+    # Read each variable set once and threshold at 0.5 to allow for solver tolerance
+    x_vals = np.fromiter((var.varValue for var in x), dtype=np.float64, count=len(x))
+    y_vals = np.fromiter((var.varValue for var in y), dtype=np.float64, count=len(y))
+    b_vals = np.fromiter((var.varValue for var in b), dtype=np.float64, count=len(b))
+    if solver_reads_start:
+        # Only the latest pool is kept per solve type, so a sweep over projections doesn't grow this
+        _last_solutions[solve_key] = (player_pool, (x_vals, y_vals, b_vals))
+    x_mask = x_vals > 0.5
+    y_mask = y_vals > 0.5
+    selected_drivers = driver_names[x_mask].tolist()
+    selected_constructors = constructor_names[y_mask].tolist()
+    boosted_idx = int(np.argmax(b_vals))
+    boosted_driver = driver_names[boosted_idx]
     transfers_used = (
-        sum(1 for d in selected_drivers if d not in previous_drivers) +
-        sum(1 for c in selected_constructors if c not in previous_constructors)
+        sum(1 for d in selected_drivers if d not in prev_driver_set) +
+        sum(1 for c in selected_constructors if c not in prev_constructor_set)
     )
     penalty = lp.value(penalty_transfers)
     
     # Calculate base expected points (without the price change bonus)
     base_xPts = (
-        sum(constructors.loc[c, 'xPts'] for c in selected_constructors) +
-        sum(drivers.loc[d, 'xPts'] for d in selected_drivers) +
-        drivers.loc[boosted_driver, 'xPts'] -
+        constructor_xpts[y_mask].sum() +
+        driver_xpts[x_mask].sum() +
+        driver_xpts[boosted_idx] -
         10 * penalty
     )
     
     # Calculate cost details
-    selected_drivers_prices = [drivers.loc[d, 'price'] for d in selected_drivers]
-    selected_constructors_prices = [constructors.loc[c, 'price'] for c in selected_constructors]
-    total_selected_cost = sum(selected_drivers_prices) + sum(selected_constructors_prices)
+    total_selected_cost = driver_prices[x_mask].sum() + constructor_prices[y_mask].sum()
     new_remaining_budget = cost_cap - total_selected_cost
     
     # Calculate projected team price change
-    projected_price_change = (
-        sum(drivers.loc[d, 'price_change'] for d in selected_drivers) +
-        sum(constructors.loc[c, 'price_change'] for c in selected_constructors)
-    )
+    projected_price_change = driver_pc[x_mask].sum() + constructor_pc[y_mask].sum()
 
     # Determine transfers to make
-    drivers_to_add = [d for d in selected_drivers if d not in previous_drivers]
-    drivers_to_remove = [d for d in previous_drivers if d not in selected_drivers]
-    constructors_to_add = [c for c in selected_constructors if c not in previous_constructors]
-    constructors_to_remove = [c for c in previous_constructors if c not in selected_constructors]
+    selected_driver_set = frozenset(selected_drivers)
+    selected_constructor_set = frozenset(selected_constructors)
+    drivers_to_add = [d for d in selected_drivers if d not in prev_driver_set]
+    drivers_to_remove = [d for d in previous_drivers if d not in selected_driver_set]
+    constructors_to_add = [c for c in selected_constructors if c not in prev_constructor_set]
+    constructors_to_remove = [c for c in previous_constructors if c not in selected_constructor_set]
 
-    transfers = []
-    for i in range(min(len(drivers_to_remove), len(drivers_to_add))):
-        transfers.append(f"{drivers_to_remove[i]} > {drivers_to_add[i]}")
-    for i in range(min(len(constructors_to_remove), len(constructors_to_add))):
-        transfers.append(f"{constructors_to_remove[i]} > {constructors_to_add[i]}")
+    transfers = [
+        f"{removed} > {added}"
+        for removed, added in chain(zip(drivers_to_remove, drivers_to_add), zip(constructors_to_remove, constructors_to_add))
+    ]
 
-    # Display transfers
-    print_if_enabled("\nTransfers to Make:")
-    print_if_enabled("---------------------")
-    if transfers:
-        for transfer in transfers:
-            print_if_enabled(transfer)
+    # First race grants 2 transfers, otherwise an unused transfer rolls over (max 3)
+    if not previous_drivers and not previous_constructors:
+        next_available_transfers = 2
     else:
-        print_if_enabled("No transfers needed. The optimal team is the same as the previous team.")
+        next_available_transfers = 3 if transfers_used < available_transfers else 2
 
-    # Display optimal team details
-    print_if_enabled("\nOptimal Team Selection:")
-    print_if_enabled("---------------------")
-    print_if_enabled("Selected Drivers:", ", ".join(selected_drivers))
-    print_if_enabled("Selected Constructors:", ", ".join(selected_constructors))
-    print_if_enabled("DRS Boost Driver:", boosted_driver)
-    print_if_enabled(f"Total Expected Points (Base): {base_xPts:.2f}")
-    print_if_enabled(f"Projected Team Price Change: {projected_price_change:.2f}")
-    print_if_enabled(f"Transfers Used: {transfers_used}")
-    print_if_enabled(f"Penalty Transfers: {penalty}")
-    print_if_enabled(f"Available Transfers: {available_transfers}")
-    print_if_enabled(f"Cost Cap: {cost_cap:.2f}")
-    print_if_enabled(f"Total Team Cost: {total_selected_cost:.2f}")
-    print_if_enabled(f"Remaining Budget: {new_remaining_budget:.2f}")
-
-    # Only prompt to save if ask_to_save is True
-    if ask_to_save:
-        save = input("\nDo you want to save this team? (y/n): ").lower().strip()
-        if save == 'y':
-            if not previous_drivers and not previous_constructors:  # First race
-                next_available_transfers = 2
-            else:
-                next_available_transfers = 3 if transfers_used < available_transfers else 2
-            
-            # Only 2 transfers if wildcarding
-            if is_wildcard:
-                next_available_transfers = 2
-            
-            if is_limitless:
-                print_if_enabled('Team is Limitless so will not be saved for next gameweek, skipping save...')
-                return
-
-            team_data = {
-                "drivers": selected_drivers,
-                "constructors": selected_constructors,
-                "available_transfers": next_available_transfers,
-                "remaining_budget": round(new_remaining_budget, 1)
-            }
-
-            # Ensure the 'data' directory exists
-            os.makedirs("data", exist_ok=True)
-            with open('data/team.json', 'w') as f:
-                json.dump(team_data, f, indent=4)
-            print_if_enabled("Team saved successfully to 'data/team.json'.")
-        else:
-            print_if_enabled("Team not saved.")
+    # Only 2 transfers if wildcarding
+    if is_wildcard:
+        next_available_transfers = 2
 
     solve_name = "Normal"
     if is_wildcard:
@@ -265,7 +281,15 @@ def normal_solve(projections, is_wildcard=False, is_limitless=False, show_prints
         "boosted_driver": boosted_driver,
         "transfers": transfers,
         "base_xPts": base_xPts,
-        "projected_price_change": projected_price_change
+        "projected_price_change": projected_price_change,
+        "transfers_used": transfers_used,
+        "penalty_transfers": penalty,
+        "available_transfers": available_transfers,
+        "cost_cap": cost_cap,
+        "total_team_cost": total_selected_cost,
+        "remaining_budget": new_remaining_budget,
+        "next_available_transfers": next_available_transfers
     }
 
-    return return_dic
\ No newline at end of file
+    _solve_results[(is_wildcard, is_limitless)] = (result_key, copy.deepcopy(return_dic))
+    return report_solve_result(return_dic, show_prints=show_prints, ask_to_save=ask_to_save)
@@ -0,0 +1,37 @@
+import pulp as lp
+
+def get_solver(threads, warm_start=False):
+    """
+    Return the fastest available PuLP solver for the team selection models.
+
+    HiGHS is preferred, first through its in-process API when highspy is installed,
+    which avoids writing the model to disk and starting a subprocess, then through
+    the HiGHS command line binary. Otherwise this falls back to the CBC binary
+    bundled with PuLP. Both command line solvers use the MIP start, but the
+    in-process API ignores it (see `uses_warm_start`).
+
+    Args:
+        threads (int): Number of threads the solver may use.
+        warm_start (bool, optional): Whether initial values have been set on the
+            variables. Defaults to False.
+
+    Returns:
+        LpSolver: The configured PuLP solver.
+    """
+    highs = lp.HiGHS(msg=False, threads=threads)
+    if highs.available():
+        return highs
+    highs_cmd = lp.HiGHS_CMD(msg=False, threads=threads, warmStart=warm_start)
+    if highs_cmd.available():
+        return highs_cmd
+    return lp.PULP_CBC_CMD(msg=False, threads=threads, presolve=True, cuts=True, warmStart=warm_start)
+
+def uses_warm_start():
+    """
+    Return whether the solver picked by `get_solver` will use a MIP start.
+
+    Returns:
+        bool: False if the in-process HiGHS API will be used, since it ignores the
+            initial values of the variables, True otherwise.
+    """
+    return not lp.HiGHS().available()
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TEAM_FILE = os.path.join("data", "team.json")
+
+@lru_cache(maxsize=1)
+def _load_team_file(path, mtime_ns):
+    """
+    Parse the saved team file, cached until the file's modification time changes.
+
+    Args:
+        path (str): Path to the team JSON file.
+        mtime_ns (int): Modification time of the file, used to invalidate the cache.
+
+    Returns:
+        dict: The parsed team data.
+    """
+    with open(path, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
+
+def load_team_state():
+    """
+    Load the saved team from 'data/team.json'.
+
+    The parsed file is reused across solves until the file is rewritten, so
+    repeated solves in the same process only read it once.
+
+    Returns:
+        dict: The saved team data. Callers must not mutate it.
+
+    Raises:
+        FileNotFoundError: If no team has been saved yet.
+        json.JSONDecodeError: If the file does not contain valid JSON.
+    """
+    return _load_team_file(TEAM_FILE, os.stat(TEAM_FILE).st_mtime_ns)
+
+def print_solve_result(result):
+    """
+    Print the transfers and optimal team details for a solve result.
+
+    Args:
+        result (dict): A solve result as returned by `normal_solve` or `drs_solve`.
+    """
+    # Build the whole report and write it in one call rather than one print per line
+    lines = ["", "Transfers to Make:", "---------------------"]
+    if result['transfers']:
+        lines.extend(result['transfers'])
+    else:
+        lines.append("No transfers needed. The optimal team is the same as the previous team.")
+
+    lines.extend(["", "Optimal Team Selection:", "---------------------"])
+    lines.append(f"Selected Drivers: {', '.join(result['selected_drivers'])}")
+    lines.append(f"Selected Constructors: {', '.join(result['selected_constructors'])}")
+    if 'boosted_driver' in result:
+        lines.append(f"DRS Boost Driver: {result['boosted_driver']}")
+    else:
+        lines.append(f"2x DRS Boost Driver: {result['boosted_driver_2x']}")
+        lines.append(f"3x DRS Boost Driver: {result['boosted_driver_3x']}")
+    lines.extend([
+        f"Total Expected Points (Base): {result['base_xPts']:.2f}",
+        f"Projected Team Price Change: {result['projected_price_change']:.2f}",
+        f"Transfers Used: {result['transfers_used']}",
+        f"Penalty Transfers: {result['penalty_transfers']}",
+        f"Available Transfers: {result['available_transfers']}",
+        f"Cost Cap: {result['cost_cap']:.2f}",
+        f"Total Team Cost: {result['total_team_cost']:.2f}",
+        f"Remaining Budget: {result['remaining_budget']:.2f}"
+    ])
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def report_solve_result(result, show_prints=True, ask_to_save=True):
+    """
+    Print a solve result and prompt to save it, as enabled by the solve's options.
+
+    Args:
+        result (dict): A solve result as returned by `normal_solve` or `drs_solve`.
+        show_prints (bool, optional): Whether to print the result. Defaults to True.
+        ask_to_save (bool, optional): Whether to prompt the user to save the team. Defaults to True.
+
+    Returns:
+        dict: The same solve result, so solves can return this call directly.
+    """
+    if show_prints:
+        print_solve_result(result)
+
+    # Only prompt to save if ask_to_save is True
+    if ask_to_save:
+        ask_to_save_team(result, show_prints=show_prints)
+
+    return result
+
+def ask_to_save_team(result, show_prints=True):
+    """
+    Prompt the user to save the team from a solve result to 'data/team.json'.
+
+    Limitless teams revert after the race, so they are never saved.
+
+    Args:
+        result (dict): A solve result as returned by `normal_solve` or `drs_solve`.
+        show_prints (bool, optional): Whether to print output messages. Defaults to True.
+
+    Returns:
+        bool: True if the team was written to 'data/team.json', False otherwise.
+    """
+    def print_if_enabled(*args, **kwargs):
+        if show_prints:
+            print(*args, **kwargs)
+
+    save = input("\nDo you want to save this team? (y/n): ").lower().strip()
+    if save != 'y':
+        print_if_enabled("Team not saved.")
+        return False
+
+    if result['solve_name'] == "Limitless":
+        print_if_enabled('Team is Limitless so will not be saved for next gameweek, skipping save...')
+        return False
+
+    team_data = {
+        "drivers": result['selected_drivers'],
+        "constructors": result['selected_constructors'],
+        "available_transfers": result['next_available_transfers'],
+        "remaining_budget": round(float(result['remaining_budget']), 1)
+    }
+
+    # Ensure the 'data' directory exists
+    os.makedirs("data", exist_ok=True)
+    if orjson is not None:
+        with open(TEAM_FILE, 'wb') as f:
+            f.write(orjson.dumps(team_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(TEAM_FILE, 'w') as f:
+            json.dump(team_data, f, indent=2)
+    print_if_enabled("Team saved successfully to 'data/team.json'.")
+    return True
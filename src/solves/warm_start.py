@@ -0,0 +1,36 @@
+def set_previous_team_start(x, y, boosts, previous_drivers, previous_constructors, driver_xpts):
+    """
+    Set the previous team as the initial solution of a team selection model.
+
+    Keeping the previous team uses no transfers and its value is always within the
+    cost cap, so it is a feasible MIP start for every solve type. The boosts are
+    handed to the previous drivers in descending order of xPts.
+
+    Args:
+        x (dict): Driver selection variables keyed by driver name.
+        y (dict): Constructor selection variables keyed by constructor name.
+        boosts (list): Boost assignment variable dicts keyed by driver name, ordered
+            from the largest multiplier to the smallest.
+        previous_drivers (list): Names of the drivers in the previous team.
+        previous_constructors (list): Names of the constructors in the previous team.
+        driver_xpts (dict): Expected points of each driver, keyed by name.
+
+    Returns:
+        bool: True if the initial values were set, False if the previous team is
+            incomplete or no longer in the projections.
+    """
+    kept_drivers = [d for d in previous_drivers if d in x]
+    kept_constructors = [c for c in previous_constructors if c in y]
+    if len(kept_drivers) != 5 or len(kept_constructors) != 2:
+        return False
+
+    for d, var in x.items():
+        var.setInitialValue(1 if d in kept_drivers else 0)
+    for c, var in y.items():
+        var.setInitialValue(1 if c in kept_constructors else 0)
+
+    boosted = sorted(kept_drivers, key=lambda d: driver_xpts[d], reverse=True)[:len(boosts)]
+    for boost, boosted_driver in zip(boosts, boosted):
+        for d, var in boost.items():
+            var.setInitialValue(1 if d == boosted_driver else 0)
+    return True